@@ -0,0 +1,35 @@
+"""composite indexes for keyset pagination of orders
+
+Revision ID: 0002_orders_keyset_indexes
+Revises: 0001_add_order_columns
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "0002_orders_keyset_indexes"
+down_revision = "0001_add_order_columns"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # GET /orchestration/orders pages newest-first on (created_at, id),
+    # optionally filtered by status or customer_id
+    op.create_index("ix_orders_created_at_id", "orders", ["created_at", "id"])
+    op.create_index(
+        "ix_orders_status_created_at_id", "orders", ["status", "created_at", "id"]
+    )
+    op.create_index(
+        "ix_orders_customer_created_at_id",
+        "orders",
+        ["customer_id", "created_at", "id"],
+    )
+
+
+def downgrade():
+    op.drop_index("ix_orders_customer_created_at_id", table_name="orders")
+    op.drop_index("ix_orders_status_created_at_id", table_name="orders")
+    op.drop_index("ix_orders_created_at_id", table_name="orders")
@@ -0,0 +1,102 @@
+"""normalize order items into an order_items table
+
+Revision ID: 0003_order_items
+Revises: 0002_orders_keyset_indexes
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0003_order_items"
+down_revision = "0002_orders_keyset_indexes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "order_items",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column(
+            "order_id",
+            sa.String(),
+            sa.ForeignKey("orders.order_id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("line_no", sa.Integer(), nullable=False),
+        sa.Column(
+            "menu_item_id",
+            sa.Integer(),
+            sa.ForeignKey("menu_items.id"),
+            nullable=True,
+        ),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("unit_price", sa.Float(), nullable=False),
+        sa.Column("quantity", sa.Integer(), nullable=False),
+    )
+    op.create_index(
+        "ix_order_items_order_id_line_no",
+        "order_items",
+        ["order_id", "line_no"],
+        unique=True,
+    )
+    op.create_index("ix_order_items_menu_item_id", "order_items", ["menu_item_id"])
+
+    # expand the JSON carts; lines are linked to the menu by name, since the
+    # old payload never carried menu ids
+    op.execute("""
+        INSERT INTO order_items
+            (order_id, line_no, menu_item_id, name, unit_price, quantity)
+        SELECT o.order_id,
+               line.ordinality,
+               m.id,
+               line.value->>'name',
+               COALESCE((line.value->>'price')::double precision, 0),
+               COALESCE((line.value->>'quantity')::integer, 1)
+        FROM orders o
+        CROSS JOIN LATERAL jsonb_array_elements(o.items::jsonb)
+            WITH ORDINALITY AS line(value, ordinality)
+        LEFT JOIN LATERAL (
+            SELECT id FROM menu_items
+            WHERE name = line.value->>'name'
+            ORDER BY is_deleted, id
+            LIMIT 1
+        ) m ON true
+        WHERE o.items IS NOT NULL AND o.items <> ''
+        """)
+
+    op.drop_column("kitchen_orders", "items")
+    op.drop_column("orders", "items")
+
+
+def downgrade():
+    op.add_column("orders", sa.Column("items", sa.Text(), nullable=True))
+    op.add_column("kitchen_orders", sa.Column("items", sa.Text(), nullable=True))
+    op.execute("""
+        UPDATE orders o
+        SET items = (
+            SELECT json_agg(
+                       json_build_object(
+                           'name', i.name,
+                           'price', i.unit_price,
+                           'quantity', i.quantity
+                       )
+                       ORDER BY i.line_no
+                   )::text
+            FROM order_items i
+            WHERE i.order_id = o.order_id
+        )
+        """)
+    op.execute("""
+        UPDATE kitchen_orders k
+        SET items = o.items
+        FROM orders o
+        WHERE o.order_id = k.order_id
+        """)
+
+    op.drop_index("ix_order_items_menu_item_id", table_name="order_items")
+    op.drop_index("ix_order_items_order_id_line_no", table_name="order_items")
+    op.drop_table("order_items")
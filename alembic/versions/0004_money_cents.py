@@ -0,0 +1,43 @@
+"""store money as integer cents
+
+Revision ID: 0004_money_cents
+Revises: 0003_order_items
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0004_money_cents"
+down_revision = "0003_order_items"
+branch_labels = None
+depends_on = None
+
+# (table, float column, cents column, cents type, nullable)
+MONEY_COLUMNS = [
+    ("orders", "total_amount", "total_amount_cents", sa.BigInteger(), True),
+    ("payments", "amount", "amount_cents", sa.BigInteger(), True),
+    ("menu_items", "price", "price_cents", sa.Integer(), True),
+    ("order_items", "unit_price", "unit_price_cents", sa.Integer(), False),
+]
+
+
+def upgrade():
+    for table, old, new, type_, nullable in MONEY_COLUMNS:
+        op.add_column(table, sa.Column(new, type_, nullable=True))
+        # ROUND on numeric is half away from zero, matching to_cents()
+        op.execute(f"UPDATE {table} SET {new} = ROUND({old}::numeric * 100)")
+        if not nullable:
+            op.alter_column(table, new, nullable=False)
+        op.drop_column(table, old)
+
+
+def downgrade():
+    for table, old, new, type_, nullable in reversed(MONEY_COLUMNS):
+        op.add_column(table, sa.Column(old, sa.Float(), nullable=True))
+        op.execute(f"UPDATE {table} SET {old} = {new} / 100.0")
+        if not nullable:
+            op.alter_column(table, old, nullable=False)
+        op.drop_column(table, new)
@@ -0,0 +1,114 @@
+"""hourly order aggregates for reports
+
+Revision ID: 0005_order_stats
+Revises: 0004_money_cents
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0005_order_stats"
+down_revision = "0004_money_cents"
+branch_labels = None
+depends_on = None
+
+COUNTERS = [
+    "orders_created",
+    "orders_confirmed",
+    "orders_delivered",
+    "orders_cancelled",
+    "revenue_cents",
+    "kitchen_ready",
+    "kitchen_seconds",
+]
+
+
+def upgrade():
+    op.create_table(
+        "order_stats_hourly",
+        sa.Column("id", sa.BigInteger(), primary_key=True),
+        sa.Column("bucket", sa.DateTime(), nullable=False),
+        *(
+            sa.Column(c, sa.BigInteger(), nullable=False, server_default="0")
+            for c in COUNTERS
+        ),
+    )
+    op.create_index("ix_order_stats_hourly_bucket", "order_stats_hourly", ["bucket"])
+    op.create_table(
+        "order_status_hourly",
+        sa.Column("id", sa.BigInteger(), primary_key=True),
+        sa.Column("bucket", sa.DateTime(), nullable=False),
+        sa.Column("status", sa.String(), nullable=False),
+        sa.Column("orders", sa.BigInteger(), nullable=False, server_default="0"),
+    )
+    op.create_index("ix_order_status_hourly_bucket", "order_status_hourly", ["bucket"])
+
+    # backfill one compacted row per hour from the existing orders; the
+    # service journals everything from here on
+    op.execute("""
+        INSERT INTO order_stats_hourly
+            (bucket, orders_created, orders_confirmed, orders_delivered,
+             orders_cancelled, revenue_cents, kitchen_ready, kitchen_seconds)
+        SELECT bucket, SUM(created), SUM(confirmed), SUM(delivered),
+               SUM(cancelled), SUM(revenue), SUM(ready), SUM(ready_seconds)
+        FROM (
+            SELECT date_trunc('hour', o.created_at) AS bucket,
+                   1 AS created, 0 AS confirmed, 0 AS delivered,
+                   0 AS cancelled, 0 AS revenue, 0 AS ready, 0 AS ready_seconds
+            FROM orders o
+            UNION ALL
+            SELECT date_trunc('hour', h.changed_at), 0,
+                   (h.status = 'confirmed')::int,
+                   (h.status = 'delivered')::int,
+                   (h.status = 'cancelled')::int,
+                   CASE
+                       WHEN h.status = 'confirmed'
+                           THEN COALESCE(o.total_amount_cents, 0)
+                       -- cancelling a paid order refunds it
+                       WHEN h.status = 'cancelled' AND EXISTS (
+                           SELECT 1 FROM order_status_history p
+                           WHERE p.order_id = h.order_id
+                             AND p.status = 'confirmed'
+                             AND p.changed_at <= h.changed_at
+                       ) THEN -COALESCE(o.total_amount_cents, 0)
+                       ELSE 0
+                   END,
+                   0, 0
+            FROM order_status_history h
+            JOIN orders o ON o.order_id = h.order_id
+            WHERE h.status IN ('confirmed', 'delivered', 'cancelled')
+            UNION ALL
+            -- orders cancelled by the initial saga carry no history row
+            SELECT date_trunc('hour', o.created_at), 0, 0, 0, 1, 0, 0, 0
+            FROM orders o
+            WHERE o.status = 'cancelled'
+              AND NOT EXISTS (
+                  SELECT 1 FROM order_status_history h
+                  WHERE h.order_id = o.order_id AND h.status = 'cancelled'
+              )
+            UNION ALL
+            SELECT date_trunc('hour', h.changed_at), 0, 0, 0, 0, 0, 1,
+                   GREATEST(0, EXTRACT(EPOCH FROM h.changed_at - k.created_at))
+            FROM order_status_history h
+            JOIN kitchen_orders k
+              ON k.order_id = h.order_id AND k.status = 'ready'
+            WHERE h.status = 'ready'
+        ) deltas
+        GROUP BY bucket
+        """)
+    op.execute("""
+        INSERT INTO order_status_hourly (bucket, status, orders)
+        SELECT date_trunc('hour', created_at), status, COUNT(*)
+        FROM orders
+        GROUP BY 1, 2
+        """)
+
+
+def downgrade():
+    op.drop_index("ix_order_status_hourly_bucket", table_name="order_status_hourly")
+    op.drop_table("order_status_hourly")
+    op.drop_index("ix_order_stats_hourly_bucket", table_name="order_stats_hourly")
+    op.drop_table("order_stats_hourly")
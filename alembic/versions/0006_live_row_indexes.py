@@ -0,0 +1,113 @@
+"""partial composite indexes over live (not soft-deleted) rows
+
+Revision ID: 0006_live_row_indexes
+Revises: 0005_order_stats
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0006_live_row_indexes"
+down_revision = "0005_order_stats"
+branch_labels = None
+depends_on = None
+
+LIVE_ROWS = sa.text("is_deleted = false")
+
+# (table, index, columns); every hot query filters on is_deleted = false
+LIVE_INDEXES = [
+    ("orders", "ix_orders_live_created_at_id", ["created_at", "id"]),
+    (
+        "orders",
+        "ix_orders_live_status_created_at_id",
+        ["status", "created_at", "id"],
+    ),
+    (
+        "orders",
+        "ix_orders_live_customer_created_at_id",
+        ["customer_id", "created_at", "id"],
+    ),
+    ("payments", "ix_payments_live_order_id_created_at", ["order_id", "created_at"]),
+    (
+        "kitchen_orders",
+        "ix_kitchen_orders_live_order_id_created_at",
+        ["order_id", "created_at"],
+    ),
+    ("kitchen_orders", "ix_kitchen_orders_live_created_at", ["created_at"]),
+    (
+        "kitchen_orders",
+        "ix_kitchen_orders_live_status_created_at",
+        ["status", "created_at"],
+    ),
+    (
+        "deliveries",
+        "ix_deliveries_live_order_id_created_at",
+        ["order_id", "created_at"],
+    ),
+    ("deliveries", "ix_deliveries_live_created_at", ["created_at"]),
+    (
+        "deliveries",
+        "ix_deliveries_live_status_created_at",
+        ["status", "created_at"],
+    ),
+    (
+        "order_status_history",
+        "ix_order_status_history_live_order_id_changed_at",
+        ["order_id", "changed_at"],
+    ),
+]
+
+# indexes made redundant by the ones above (same leading columns)
+REPLACED_INDEXES = [
+    ("orders", "ix_orders_created_at_id", ["created_at", "id"]),
+    ("orders", "ix_orders_status_created_at_id", ["status", "created_at", "id"]),
+    (
+        "orders",
+        "ix_orders_customer_created_at_id",
+        ["customer_id", "created_at", "id"],
+    ),
+    ("orders", "ix_orders_customer_id", ["customer_id"]),
+    ("payments", "ix_payments_order_id", ["order_id"]),
+    ("kitchen_orders", "ix_kitchen_orders_order_id", ["order_id"]),
+    ("deliveries", "ix_deliveries_order_id", ["order_id"]),
+    ("order_status_history", "ix_order_status_history_order_id", ["order_id"]),
+]
+
+
+def upgrade():
+    # CONCURRENTLY keeps the tables writable while the indexes build
+    with op.get_context().autocommit_block():
+        for table, name, columns in LIVE_INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                postgresql_where=LIVE_ROWS,
+                postgresql_concurrently=True,
+            )
+        for table, name, _ in REPLACED_INDEXES:
+            op.drop_index(
+                name,
+                table_name=table,
+                postgresql_concurrently=True,
+            )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for table, name, columns in REPLACED_INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                postgresql_concurrently=True,
+            )
+        for table, name, _ in LIVE_INDEXES:
+            op.drop_index(
+                name,
+                table_name=table,
+                postgresql_concurrently=True,
+            )
@@ -0,0 +1,121 @@
+"""range-partition order_status_history by month
+
+Revision ID: 0007_history_partitions
+Revises: 0006_live_row_indexes
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "0007_history_partitions"
+down_revision = "0006_live_row_indexes"
+branch_labels = None
+depends_on = None
+
+# months after the current one to pre-create; the service keeps this up
+MONTHS_AHEAD = 3
+
+
+def upgrade():
+    op.execute("ALTER TABLE order_status_history RENAME TO order_status_history_legacy")
+    op.execute(
+        "ALTER SEQUENCE order_status_history_id_seq "
+        "RENAME TO order_status_history_legacy_id_seq"
+    )
+    op.execute(
+        "ALTER INDEX ix_order_status_history_live_order_id_changed_at "
+        "RENAME TO ix_order_status_history_legacy_order_id_changed_at"
+    )
+
+    # the partition key has to be part of the primary key
+    op.execute("""
+        CREATE TABLE order_status_history (
+            id BIGSERIAL NOT NULL,
+            order_id VARCHAR,
+            status VARCHAR,
+            changed_at TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+            is_deleted BOOLEAN,
+            deleted_at TIMESTAMP WITHOUT TIME ZONE,
+            PRIMARY KEY (id, changed_at)
+        ) PARTITION BY RANGE (changed_at)
+        """)
+    op.execute(
+        "CREATE INDEX ix_order_status_history_live_order_id_changed_at "
+        "ON order_status_history (order_id, changed_at) WHERE is_deleted = false"
+    )
+
+    # one partition per month from the oldest row to MONTHS_AHEAD from now
+    op.execute(f"""
+        DO $$
+        DECLARE
+            m date := date_trunc('month', LEAST(
+                (SELECT min(changed_at) FROM order_status_history_legacy),
+                now()::timestamp
+            ));
+            last date := date_trunc('month', now()) + interval '{MONTHS_AHEAD} months';
+        BEGIN
+            WHILE m <= last LOOP
+                EXECUTE format(
+                    'CREATE TABLE order_status_history_p%s '
+                    'PARTITION OF order_status_history '
+                    'FOR VALUES FROM (%L) TO (%L)',
+                    to_char(m, 'YYYYMM'), m, m + interval '1 month'
+                );
+                m := m + interval '1 month';
+            END LOOP;
+        END $$
+        """)
+
+    op.execute("""
+        INSERT INTO order_status_history
+            (id, order_id, status, changed_at, is_deleted, deleted_at)
+        SELECT id, order_id, status, COALESCE(changed_at, now()),
+               is_deleted, deleted_at
+        FROM order_status_history_legacy
+        """)
+    op.execute(
+        "SELECT setval('order_status_history_id_seq', "
+        "COALESCE((SELECT max(id) FROM order_status_history), 0) + 1, false)"
+    )
+    op.execute("DROP TABLE order_status_history_legacy")
+
+
+def downgrade():
+    op.execute("ALTER TABLE order_status_history RENAME TO order_status_history_parted")
+    op.execute(
+        "ALTER SEQUENCE order_status_history_id_seq "
+        "RENAME TO order_status_history_parted_id_seq"
+    )
+    op.execute(
+        "ALTER INDEX ix_order_status_history_live_order_id_changed_at "
+        "RENAME TO ix_order_status_history_parted_order_id_changed_at"
+    )
+    op.execute("""
+        CREATE TABLE order_status_history (
+            id SERIAL PRIMARY KEY,
+            order_id VARCHAR,
+            status VARCHAR,
+            changed_at TIMESTAMP WITHOUT TIME ZONE,
+            is_deleted BOOLEAN,
+            deleted_at TIMESTAMP WITHOUT TIME ZONE
+        )
+        """)
+    op.execute("CREATE INDEX ix_order_status_history_id ON order_status_history (id)")
+    op.execute(
+        "CREATE INDEX ix_order_status_history_live_order_id_changed_at "
+        "ON order_status_history (order_id, changed_at) WHERE is_deleted = false"
+    )
+    # archived (dropped) partitions are not restored
+    op.execute("""
+        INSERT INTO order_status_history
+            (id, order_id, status, changed_at, is_deleted, deleted_at)
+        SELECT id, order_id, status, changed_at, is_deleted, deleted_at
+        FROM order_status_history_parted
+        """)
+    op.execute(
+        "SELECT setval('order_status_history_id_seq', "
+        "COALESCE((SELECT max(id) FROM order_status_history), 0) + 1, false)"
+    )
+    op.execute("DROP TABLE order_status_history_parted")
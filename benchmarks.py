@@ -0,0 +1,260 @@
+"""Load benchmarks against a running order service.
+
+Start the backend (e.g. with SAGA_ASYNC_MODE=1 and again with
+SAGA_ASYNC_MODE=0) and compare the numbers printed by:
+
+    python benchmarks.py orders --requests 500 --concurrency 50
+    python benchmarks.py login-storm --logins 200 --concurrency 50
+    python benchmarks.py large-cart --sizes 1,10,100,500 --requests 100
+    python benchmarks.py burst --orders 100 --concurrency 10
+"""
+
+import argparse
+import asyncio
+import logging
+import statistics
+import time
+
+import httpx
+
+logging.basicConfig(level=logging.INFO, format="%(message)s")
+logger = logging.getLogger("benchmarks")
+
+ORDER_SERVICE_URL = "http://localhost:8002"
+
+
+def percentile(samples, pct):
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def report(label, latencies, errors, elapsed):
+    total = len(latencies) + errors
+    logger.info("== %s ==", label)
+    logger.info("requests: %d  errors: %d  elapsed: %.2fs", total, errors, elapsed)
+    logger.info("throughput: %.1f req/s", total / elapsed if elapsed else 0.0)
+    if latencies:
+        logger.info(
+            "latency ms  mean %.1f  p50 %.1f  p95 %.1f  p99 %.1f  max %.1f",
+            statistics.mean(latencies) * 1000,
+            percentile(latencies, 50) * 1000,
+            percentile(latencies, 95) * 1000,
+            percentile(latencies, 99) * 1000,
+            max(latencies) * 1000,
+        )
+
+
+async def login(client, username, password):
+    resp = await client.post(
+        "/token", data={"username": username, "password": password}
+    )
+    resp.raise_for_status()
+    token = resp.json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    me = await client.get("/orchestration/users/me", headers=headers)
+    me.raise_for_status()
+    return headers, me.json()
+
+
+async def order_body(client, me, size):
+    """An order with ``size`` lines cycling through the current menu."""
+    resp = await client.get("/orchestration/menu/items")
+    resp.raise_for_status()
+    menu = resp.json()
+    if not menu:
+        raise SystemExit("menu is empty; create a few menu items first")
+    return {
+        "customer_id": me["customer_id"],
+        "items": [
+            {"id": menu[i % len(menu)]["id"], "quantity": 1} for i in range(size)
+        ],
+        "order_type": "takeaway",
+        "payment_method": "cash",
+    }
+
+
+async def post_orders(
+    client, headers, body, requests, concurrency, path="/orchestration/orders"
+):
+    sem = asyncio.Semaphore(concurrency)
+    latencies, errors = [], 0
+
+    async def one():
+        nonlocal errors
+        async with sem:
+            start = time.perf_counter()
+            try:
+                resp = await client.post(path, json=body, headers=headers)
+                if resp.status_code != 200:
+                    errors += 1
+                    return
+            except httpx.HTTPError:
+                errors += 1
+                return
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(requests)))
+    return latencies, errors, time.perf_counter() - start
+
+
+async def bench_orders(args):
+    """Concurrent POST /orchestration/orders throughput."""
+    limits = httpx.Limits(max_connections=args.concurrency)
+    async with httpx.AsyncClient(
+        base_url=args.url, limits=limits, timeout=60.0
+    ) as client:
+        headers, me = await login(client, args.username, args.password)
+        body = await order_body(client, me, args.items)
+        latencies, errors, elapsed = await post_orders(
+            client, headers, body, args.requests, args.concurrency
+        )
+        report(
+            f"create_order x{args.requests} @ concurrency {args.concurrency}",
+            latencies,
+            errors,
+            elapsed,
+        )
+
+
+async def bench_large_cart(args):
+    """create_order latency as the number of cart lines grows."""
+    limits = httpx.Limits(max_connections=args.concurrency)
+    async with httpx.AsyncClient(
+        base_url=args.url, limits=limits, timeout=60.0
+    ) as client:
+        headers, me = await login(client, args.username, args.password)
+        for size in (int(s) for s in args.sizes.split(",")):
+            body = await order_body(client, me, size)
+            latencies, errors, elapsed = await post_orders(
+                client, headers, body, args.requests, args.concurrency
+            )
+            report(
+                f"create_order {size} lines x{args.requests} "
+                f"@ concurrency {args.concurrency}",
+                latencies,
+                errors,
+                elapsed,
+            )
+
+
+async def bench_burst(args):
+    """A kiosk burst sent as single orders versus one batch request."""
+    limits = httpx.Limits(max_connections=args.concurrency)
+    async with httpx.AsyncClient(
+        base_url=args.url, limits=limits, timeout=120.0
+    ) as client:
+        headers, me = await login(client, args.username, args.password)
+        body = await order_body(client, me, args.items)
+        latencies, errors, elapsed = await post_orders(
+            client, headers, body, args.orders, args.concurrency
+        )
+        report(
+            f"create_order x{args.orders} @ concurrency {args.concurrency}",
+            latencies,
+            errors,
+            elapsed,
+        )
+        latencies, errors, elapsed = await post_orders(
+            client,
+            headers,
+            {"orders": [body] * args.orders},
+            1,
+            1,
+            path="/orchestration/orders/batch",
+        )
+        report(f"create_order_batch of {args.orders}", latencies, errors, elapsed)
+
+
+async def bench_login_storm(args):
+    """Latency of an unrelated endpoint while a burst of logins runs."""
+    limits = httpx.Limits(max_connections=args.concurrency + 1)
+    async with httpx.AsyncClient(
+        base_url=args.url, limits=limits, timeout=60.0
+    ) as client:
+        credentials = {"username": args.username, "password": args.password}
+        sem = asyncio.Semaphore(args.concurrency)
+        login_latencies, login_errors = [], 0
+        probe_latencies, probe_errors = [], 0
+        storm_done = asyncio.Event()
+
+        async def one_login():
+            nonlocal login_errors
+            async with sem:
+                start = time.perf_counter()
+                try:
+                    resp = await client.post("/token", data=credentials)
+                    if resp.status_code != 200:
+                        login_errors += 1
+                        return
+                except httpx.HTTPError:
+                    login_errors += 1
+                    return
+                login_latencies.append(time.perf_counter() - start)
+
+        async def probe():
+            nonlocal probe_errors
+            while not storm_done.is_set():
+                start = time.perf_counter()
+                try:
+                    resp = await client.get(args.probe)
+                    if resp.status_code != 200:
+                        probe_errors += 1
+                    else:
+                        probe_latencies.append(time.perf_counter() - start)
+                except httpx.HTTPError:
+                    probe_errors += 1
+                await asyncio.sleep(args.probe_interval)
+
+        probe_task = asyncio.create_task(probe())
+        start = time.perf_counter()
+        await asyncio.gather(*(one_login() for _ in range(args.logins)))
+        elapsed = time.perf_counter() - start
+        storm_done.set()
+        await probe_task
+
+        report(f"POST /token x{args.logins}", login_latencies, login_errors, elapsed)
+        report(f"GET {args.probe} during storm", probe_latencies, probe_errors, elapsed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default=ORDER_SERVICE_URL)
+    parser.add_argument("--username", default="customer")
+    parser.add_argument("--password", default="customer")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    orders = sub.add_parser("orders", help=bench_orders.__doc__)
+    orders.add_argument("--requests", type=int, default=200)
+    orders.add_argument("--concurrency", type=int, default=20)
+    orders.add_argument("--items", type=int, default=3)
+    orders.set_defaults(func=bench_orders)
+
+    cart = sub.add_parser("large-cart", help=bench_large_cart.__doc__)
+    cart.add_argument("--sizes", default="1,10,100,500")
+    cart.add_argument("--requests", type=int, default=100)
+    cart.add_argument("--concurrency", type=int, default=10)
+    cart.set_defaults(func=bench_large_cart)
+
+    burst = sub.add_parser("burst", help=bench_burst.__doc__)
+    burst.add_argument("--orders", type=int, default=100)
+    burst.add_argument("--concurrency", type=int, default=10)
+    burst.add_argument("--items", type=int, default=3)
+    burst.set_defaults(func=bench_burst)
+
+    storm = sub.add_parser("login-storm", help=bench_login_storm.__doc__)
+    storm.add_argument("--logins", type=int, default=200)
+    storm.add_argument("--concurrency", type=int, default=50)
+    storm.add_argument("--probe", default="/health")
+    storm.add_argument("--probe-interval", type=float, default=0.01)
+    storm.set_defaults(func=bench_login_storm)
+
+    args = parser.parse_args()
+    asyncio.run(args.func(args))
+
+
+if __name__ == "__main__":
+    main()
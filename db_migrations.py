@@ -1,6 +1,10 @@
 from sqlalchemy import create_engine, text
 from sqlalchemy.orm import sessionmaker
+import argparse
+import json
 import logging
+import sys
+from datetime import timedelta
 
 # 配置日誌
 logging.basicConfig(level=logging.INFO)
@@ -56,6 +60,92 @@ def ensure_soft_delete_columns():
                 logger.error(f"Error adding soft delete columns to {table}: {e}")
 
 
+def hot_queries():
+    """熱門查詢，由 backend_main 實際使用的查詢建構函式產生，每一個都必須走索引
+
+    延遲匯入 backend_main，只有檢查查詢計畫時才載入服務模組。
+    """
+    import backend_main as bm
+    from sqlalchemy import and_, select
+
+    now = bm.utcnow().replace(tzinfo=None)
+    return {
+        "order by order_id": select(bm.Order).where(
+            and_(bm.Order.order_id == "x", bm.Order.is_deleted == False)
+        ),
+        "orders page": bm.orders_page_query(bm.orders_query(), None, 21),
+        "orders page by status": bm.orders_page_query(
+            bm.orders_query(status=bm.OrderStatus.PENDING), None, 21
+        ),
+        "orders page by customer": bm.orders_page_query(
+            bm.orders_query(customer_id="x"), None, 21
+        ),
+        "orders next page": bm.orders_page_query(bm.orders_query(), (now, 1), 21),
+        "pending payments board": bm.pending_payments_query(200),
+        "latest payment of order": bm.latest_payment_query("x"),
+        "payment by payment_id": select(bm.Payment).where(
+            and_(bm.Payment.payment_id == "x", bm.Payment.is_deleted == False)
+        ),
+        "kitchen board": bm.kitchen_board_query(None, 50),
+        "kitchen board by status": bm.kitchen_board_query("received", 50),
+        "delivery board": bm.delivery_board_query(None, 50),
+        "delivery board by status": bm.delivery_board_query("pending", 50),
+        **{
+            f"{model.__tablename__} of orders": bm.order_related_query(
+                model, ["x", "y"]
+            )
+            for model in bm.ORDER_VIEW_RELATED
+        },
+        "order history": bm.order_history_query("x"),
+        "order items": bm.order_items_query(["x", "y"]),
+        "login": select(bm.User).where(
+            and_(bm.User.username == "x", bm.User.is_deleted == False)
+        ),
+        "hourly report": bm.hourly_counters_query(now - timedelta(days=1), now),
+    }
+
+
+def _plan_nodes(plan):
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from _plan_nodes(child)
+
+
+def seq_scans(conn, stmt):
+    """以 EXPLAIN 取得查詢計畫中循序掃描（Seq Scan）的資料表
+
+    關閉 enable_seqscan 後，只要有可用的索引，規劃器就會選用它；
+    仍出現 Seq Scan 代表該存取路徑缺少索引（小表或空表也能可靠偵測）。
+    """
+    compiled = stmt.compile(
+        dialect=conn.dialect, compile_kwargs={"render_postcompile": True}
+    )
+    with conn.begin():
+        conn.execute(text("SET LOCAL enable_seqscan = off"))
+        plan = conn.exec_driver_sql(
+            f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params
+        ).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return [
+        node.get("Relation Name")
+        for node in _plan_nodes(plan[0]["Plan"])
+        if node["Node Type"] == "Seq Scan"
+    ]
+
+
+def check_query_plans():
+    """檢查所有熱門查詢（與 tests/test_query_plans.py 相同），回傳出現循序掃描的查詢"""
+    failures = []
+    with engine.connect() as conn:
+        for name, stmt in hot_queries().items():
+            scans = seq_scans(conn, stmt)
+            if scans:
+                logger.error(f"Sequential scan in '{name}' on {', '.join(scans)}")
+                failures.append((name, scans))
+    return failures
+
+
 def run_migrations():
     """執行所有遷移"""
     logger.info("Starting database migrations...")
@@ -74,4 +164,13 @@ def run_migrations():
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="資料庫遷移與查詢計畫檢查")
+    parser.add_argument(
+        "--check-plans",
+        action="store_true",
+        help="以 EXPLAIN 檢查熱門查詢，出現循序掃描時以非零代碼結束",
+    )
+    args = parser.parse_args()
+    if args.check_plans:
+        sys.exit(1 if check_query_plans() else 0)
     run_migrations()
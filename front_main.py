@@ -1,6 +1,9 @@
 import streamlit as st
 import httpx
+import asyncio
 import json
+import os
+import queue
 import time
 from datetime import datetime
 import threading
@@ -19,6 +22,50 @@ logger = logging.getLogger("front_main")
 
 # 後端服務的基礎 URL
 ORDER_SERVICE_URL = "http://localhost:8002"  # Orchestration 模式的 Order Service 端口
+ORDERS_PAGE_SIZE = 20  # 訂單列表每頁筆數（後端 keyset 分頁）
+# 後端 HTTP 連線池（每個 Streamlit server process 共用，可用環境變數調整）
+HTTP_MAX_CONNECTIONS = int(os.getenv("FRONT_HTTP_MAX_CONNECTIONS", "20"))
+HTTP_MAX_KEEPALIVE = int(os.getenv("FRONT_HTTP_MAX_KEEPALIVE", "10"))
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv("FRONT_HTTP_KEEPALIVE_EXPIRY", "30"))
+HTTP_CONNECT_TIMEOUT = float(os.getenv("FRONT_HTTP_CONNECT_TIMEOUT", "3"))
+HTTP_TIMEOUT = float(os.getenv("FRONT_HTTP_TIMEOUT", "10"))
+# GET 回應快取（每個 session 一份）：端點前綴 -> TTL 秒數，先符合者優先
+API_CACHE_TTLS = [
+    ("/orchestration/users/me", 300),
+    ("/orchestration/menu/items", 60),
+    ("/orchestration/customers", 30),
+    ("/orchestration/payments/pending", 3),
+    ("/orchestration/kitchen/orders", 3),
+    ("/orchestration/delivery/orders", 3),
+    ("/orchestration/orders", 5),
+]
+# 變更請求（端點前綴）成功後要清除的 GET 前綴；未列出的變更清除全部快取
+_ORDER_VIEWS = [
+    "/orchestration/orders",
+    "/orchestration/payments/pending",
+    "/orchestration/kitchen/orders",
+    "/orchestration/delivery/orders",
+]
+API_CACHE_INVALIDATIONS = [
+    ("/orchestration/menu/admin", ["/orchestration/menu/items"]),
+    ("/orchestration/orders", _ORDER_VIEWS),
+    ("/orchestration/payments", _ORDER_VIEWS),
+    ("/orchestration/kitchen/orders", _ORDER_VIEWS),
+    ("/orchestration/users", ["/orchestration/customers"]),
+]
+API_CACHE_DEBUG = os.getenv("FRONT_CACHE_DEBUG", "0") == "1"  # 顧客也顯示除錯面板
+LIVE_REFRESH_SECONDS = 2  # 店員看板讀取 WS 事件佇列的間隔（不呼叫後端）
+LIVE_BOARD_SIZE = 50  # 看板保留的卡片數
+WS_RECONNECT_MIN_SECONDS = 1.0  # WS 斷線重連的退避起點與上限
+WS_RECONNECT_MAX_SECONDS = 30.0
+ORDER_STATUSES = [
+    "pending",
+    "confirmed",
+    "preparing",
+    "ready",
+    "delivered",
+    "cancelled",
+]
 
 st.set_page_config(layout="wide", page_title="分布式訂單系統")
 
@@ -41,6 +88,237 @@ if "ws_notifications" not in st.session_state:
     st.session_state.ws_notifications = []
 if "ws_thread_started" not in st.session_state:
     st.session_state.ws_thread_started = False
+# 目前 WS thread 的停止事件：登出時由主線程設定，thread 結束時也會自行設定
+if "ws_stop" not in st.session_state:
+    st.session_state.ws_stop = None
+# WS thread 只把事件放進這個佇列，由主線程（看板 fragment）取出套用
+if "ws_events" not in st.session_state:
+    st.session_state.ws_events = queue.Queue()
+# 店員看板資料：名稱 -> {id: 卡片資料}，載入一次後只由 WS 事件更新
+if "live_boards" not in st.session_state:
+    st.session_state.live_boards = {}
+# 通知補送範圍已被後端裁掉時設定，頁面需重新載入
+if "ws_resync_required" not in st.session_state:
+    st.session_state.ws_resync_required = False
+
+
+# 輔助函數：菜單圖片網址（優先使用後端產生的縮圖版本，尚未產生時退回原圖）
+def menu_image_url(item, rendition):
+    url = (item.get("image_urls") or {}).get(rendition) or item.get("image_url")
+    return f"{ORDER_SERVICE_URL}{url}" if url else None
+
+
+def _http_client_options():
+    return {
+        "base_url": ORDER_SERVICE_URL,
+        "limits": httpx.Limits(
+            max_connections=HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=HTTP_MAX_KEEPALIVE,
+            keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+        ),
+        "timeout": httpx.Timeout(HTTP_TIMEOUT, connect=HTTP_CONNECT_TIMEOUT),
+    }
+
+
+# 共用的 HTTP client：keep-alive 連線池跨 rerun 與 session 重複使用
+@st.cache_resource
+def get_http_client():
+    return httpx.Client(**_http_client_options())
+
+
+class PageLoader:
+    """在背景 event loop 上以 httpx.AsyncClient 並行送出頁面需要的 GET 請求
+
+    頁面先收集所有要載入的端點再一次送出，等待時間取決於最慢的請求而非總和。
+    event loop 與連線池在 server process 內共用（見 get_page_loader）。
+    """
+
+    def __init__(self):
+        self._loop = asyncio.new_event_loop()
+        threading.Thread(
+            target=self._loop.run_forever, name="page-loader", daemon=True
+        ).start()
+        self._client = httpx.AsyncClient(**_http_client_options())
+
+    async def _get(self, endpoint, params, headers):
+        try:
+            return await self._client.get(endpoint, params=params, headers=headers)
+        except httpx.HTTPError:
+            logger.exception("並行載入失敗: %s", endpoint)
+            return None
+
+    async def _gather(self, requests, headers):
+        responses = await asyncio.gather(
+            *(
+                self._get(endpoint, params, headers)
+                for endpoint, params in requests.values()
+            )
+        )
+        return dict(zip(requests.keys(), responses))
+
+    def get_many(self, requests, token=None):
+        """requests: {key: (endpoint, params)}；回傳 {key: response 或 None}"""
+        headers = {"Authorization": f"Bearer {token}"} if token else {}
+        future = asyncio.run_coroutine_threadsafe(
+            self._gather(requests, headers), self._loop
+        )
+        return future.result()
+
+
+@st.cache_resource
+def get_page_loader():
+    return PageLoader()
+
+
+class ApiCache:
+    """每個 session 的 GET 回應快取
+
+    只快取 API_CACHE_TTLS 列出的端點的 200 回應；變更請求成功後依
+    API_CACHE_INVALIDATIONS 清除相關端點。命中率依端點前綴統計，顯示於除錯面板。
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self.counters = {}  # 端點前綴 -> [hits, misses]
+        self.invalidations = 0
+
+    @staticmethod
+    def _ttl_for(endpoint):
+        for prefix, ttl in API_CACHE_TTLS:
+            if endpoint.startswith(prefix):
+                return prefix, ttl
+        return None, 0
+
+    @staticmethod
+    def _key(endpoint, params, token):
+        return endpoint, tuple(sorted((params or {}).items())), token
+
+    def get(self, endpoint, params=None, token=None):
+        prefix, ttl = self._ttl_for(endpoint)
+        if not ttl:
+            return None
+        counters = self.counters.setdefault(prefix, [0, 0])
+        entry = self._entries.get(self._key(endpoint, params, token))
+        if entry and entry[0] > time.monotonic():
+            counters[0] += 1
+            return entry[1]
+        counters[1] += 1
+        return None
+
+    def put(self, endpoint, params, token, response):
+        prefix, ttl = self._ttl_for(endpoint)
+        if not ttl or response is None or response.status_code != 200:
+            return
+        now = time.monotonic()
+        if len(self._entries) > 500:
+            self._entries = {k: v for k, v in self._entries.items() if v[0] > now}
+        self._entries[self._key(endpoint, params, token)] = (now + ttl, response)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def invalidate(self, prefixes=None):
+        """清除以 prefixes 開頭的端點；None 表示全部"""
+        self.invalidations += 1
+        if prefixes is None:
+            self._entries.clear()
+            return
+        self._entries = {
+            k: v
+            for k, v in self._entries.items()
+            if not any(k[0].startswith(p) for p in prefixes)
+        }
+
+    def invalidate_after(self, endpoint):
+        for prefix, targets in API_CACHE_INVALIDATIONS:
+            if endpoint.startswith(prefix):
+                self.invalidate(targets)
+                return
+        self.invalidate()
+
+    def stats_rows(self):
+        rows = []
+        for prefix, (hits, misses) in sorted(self.counters.items()):
+            lookups = hits + misses
+            rows.append(
+                {
+                    "端點": prefix,
+                    "命中": hits,
+                    "未命中": misses,
+                    "命中率": f"{hits / lookups:.0%}" if lookups else "-",
+                }
+            )
+        return rows
+
+
+def get_api_cache():
+    if "api_cache" not in st.session_state:
+        st.session_state.api_cache = ApiCache()
+    return st.session_state.api_cache
+
+
+def load_concurrently(requests, token=None):
+    """並行載入多個 GET；回應的錯誤處理與 make_api_request 相同，並使用 GET 快取"""
+    if not requests:
+        return {}
+    cache = get_api_cache()
+    cached = {}
+    for key, (endpoint, params) in requests.items():
+        response = cache.get(endpoint, params, token)
+        if response is not None:
+            cached[key] = response
+    missing = {key: req for key, req in requests.items() if key not in cached}
+    try:
+        responses = get_page_loader().get_many(missing, token=token) if missing else {}
+    except Exception as e:
+        logger.exception("發生錯誤於 load_concurrently")
+        st.error(f"發生錯誤: {e}")
+        return {key: cached.get(key) for key in requests}
+    for key, response in responses.items():
+        endpoint, params = missing[key]
+        cache.put(endpoint, params, token, response)
+    responses.update(cached)
+    if any(r is not None and r.status_code == 401 for r in responses.values()):
+        _check_response(
+            next(
+                r for r in responses.values() if r is not None and r.status_code == 401
+            )
+        )
+        return {key: None for key in requests}
+    return {
+        key: _check_response(r) if r is not None else None
+        for key, r in responses.items()
+    }
+
+
+# 輔助函數：共用的回應檢查（401 登出、422 顯示錯誤）
+def _check_response(response):
+    logger.debug("回應狀態碼: %s", response.status_code)
+    if response.status_code != 200:
+        logger.debug("回應內容: %s", response.text)
+
+    if response.status_code == 401:
+        st.error("認證失敗，請重新登入")
+        get_api_cache().invalidate()
+        stop_ws_client()
+        st.session_state.access_token = None
+        st.session_state.role = None
+        st.session_state.username = None
+        st.session_state.customer_id = None
+        return None
+    elif response.status_code == 422:
+        logger.info("請求參數錯誤: %s", response.text)
+        error_detail = "請求參數錯誤"
+        try:
+            error_data = response.json()
+            if "detail" in error_data:
+                error_detail = error_data["detail"]
+        except:
+            pass
+        st.error(f"請求參數錯誤: {error_detail}")
+        return None
+
+    return response
 
 
 # 輔助函數：處理API請求
@@ -56,47 +334,35 @@ def make_api_request(method, endpoint, data=None, token=None, params=None, files
     if data:
         logger.debug("請求數據: %s", data)
 
+    cache = get_api_cache()
+    if method == "GET":
+        cached = cache.get(endpoint, params, token)
+        if cached is not None:
+            logger.debug("快取命中: %s", endpoint)
+            return cached
+
     try:
-        # 使用 httpx 同步請求
+        # 使用共用連線池的 httpx 同步請求
+        client = get_http_client()
         if files:
-            response = httpx.request(
+            response = client.request(
                 method,
-                url,
+                endpoint,
                 headers=headers,
                 data=data,
                 params=params,
                 files=files,
-                timeout=10.0,
             )
         else:
-            response = httpx.request(
-                method, url, headers=headers, json=data, params=params, timeout=10.0
+            response = client.request(
+                method, endpoint, headers=headers, json=data, params=params
             )
 
-        logger.debug("回應狀態碼: %s", response.status_code)
-        if response.status_code != 200:
-            logger.debug("回應內容: %s", response.text)
-
-        if response.status_code == 401:
-            st.error("認證失敗，請重新登入")
-            st.session_state.access_token = None
-            st.session_state.role = None
-            st.session_state.username = None
-            st.session_state.customer_id = None
-            return None
-        elif response.status_code == 422:
-            logger.info("請求參數錯誤: %s", response.text)
-            error_detail = "請求參數錯誤"
-            try:
-                error_data = response.json()
-                if "detail" in error_data:
-                    error_detail = error_data["detail"]
-            except:
-                pass
-            st.error(f"請求參數錯誤: {error_detail}")
-            return None
-
-        return response
+        if method == "GET":
+            cache.put(endpoint, params, token, response)
+        elif response.status_code < 400:
+            cache.invalidate_after(endpoint)
+        return _check_response(response)
     except httpx.ConnectError:
         st.error("無法連接到後端服務，請確認服務已啟動")
         return None
@@ -116,11 +382,10 @@ def login_page():
         submit_button = st.form_submit_button(label="登入")
 
         if submit_button:
-            # 使用 httpx 直接呼叫 token endpoint (表單)
-            token_resp = httpx.post(
-                f"{ORDER_SERVICE_URL}/token",
+            # 直接呼叫 token endpoint (表單)
+            token_resp = get_http_client().post(
+                "/token",
                 data={"username": username, "password": password},
-                timeout=10.0,
             )
             if token_resp.status_code == 200:
                 token_data = token_resp.json()
@@ -131,12 +396,11 @@ def login_page():
                 # 如果是顧客，獲取customer_id
                 if token_data["role"] == "customer":
                     try:
-                        user_response = httpx.get(
-                            f"{ORDER_SERVICE_URL}/orchestration/users/me",
+                        user_response = get_http_client().get(
+                            "/orchestration/users/me",
                             headers={
                                 "Authorization": f"Bearer {st.session_state.access_token}"
                             },
-                            timeout=10.0,
                         )
                         logger.debug("用戶資訊回應: %s", user_response.status_code)
                         logger.debug("用戶資訊內容: %s", user_response.text)
@@ -225,11 +489,11 @@ def menu_page():
         cols = st.columns(3)
         for i, item in enumerate(menu_items):
             with cols[i % 3]:
-                # 顯示圖片（若有）
+                # 顯示圖片（若有）；網格使用 card 尺寸
                 if item.get("image_url"):
                     try:
                         st.image(
-                            f"{ORDER_SERVICE_URL}{item['image_url']}",
+                            menu_image_url(item, "card"),
                             use_container_width=True,
                         )
                     except:
@@ -329,6 +593,7 @@ def cart_page():
                 for item in st.session_state.cart:
                     items.append(
                         {
+                            "id": item["id"],
                             "name": item["name"],
                             "price": item["price"],
                             "quantity": item["quantity"],
@@ -373,9 +638,30 @@ def cart_page():
 def orders_page():
     st.header("📋 我的訂單")
 
-    params = None
+    params = {"limit": ORDERS_PAGE_SIZE}
     if st.session_state.role == "customer" and st.session_state.customer_id:
-        params = {"customer_id": st.session_state.customer_id}
+        params["customer_id"] = st.session_state.customer_id
+
+    # 店員可依狀態在後端篩選
+    status_filter = "全部"
+    if st.session_state.role in ["staff", "admin"]:
+        status_filter = st.selectbox(
+            "狀態篩選", ["全部"] + ORDER_STATUSES, key="orders_status_filter"
+        )
+        if status_filter != "全部":
+            params["status"] = status_filter
+
+    # 分頁游標堆疊；篩選條件改變或通知需重新同步時回到第一頁
+    if st.session_state.ws_resync_required:
+        st.session_state.ws_resync_required = False
+        st.session_state.orders_cursor_filter = None
+        get_api_cache().invalidate(_ORDER_VIEWS)
+    if st.session_state.get("orders_cursor_filter") != status_filter:
+        st.session_state.orders_cursor_filter = status_filter
+        st.session_state.orders_cursors = [None]
+    cursors = st.session_state.orders_cursors
+    if cursors[-1]:
+        params["cursor"] = cursors[-1]
 
     response = make_api_request(
         "GET",
@@ -386,11 +672,24 @@ def orders_page():
 
     if response and response.status_code == 200:
         orders = response.json()
+        next_cursor = response.headers.get("X-Next-Cursor")
 
         if not orders:
             st.info("暫無訂單記錄")
             return
 
+        # 先並行載入本頁所有訂單詳情，再開始渲染
+        details = load_concurrently(
+            {
+                order["order_id"]: (
+                    f"/orchestration/orders/{order['order_id']}/view",
+                    None,
+                )
+                for order in orders
+            },
+            token=st.session_state.access_token,
+        )
+
         for order in orders:
             with st.container():
                 col1, col2, col3 = st.columns(3)
@@ -406,46 +705,30 @@ def orders_page():
                 with col3:
                     st.write(f"**總金額:** ${order['total_amount']:.2f}")
 
-                # 展開查看詳情按鈕
+                # 展開查看詳情按鈕（單一請求取得訂單、歷史、付款、廚房與配送）
                 with st.expander("查看詳情"):
-                    order_detail_response = make_api_request(
-                        "GET",
-                        f"/orchestration/orders/{order['order_id']}",
-                        token=st.session_state.access_token,
-                    )
+                    order_detail_response = details.get(order["order_id"])
 
                     if (
                         order_detail_response
                         and order_detail_response.status_code == 200
                     ):
                         order_detail = order_detail_response.json()
+                        history = order_detail.pop("history", [])
                         st.json(order_detail)
 
-                        # 獲取訂單歷史
-                        history_response = make_api_request(
-                            "GET",
-                            f"/orchestration/orders/history/{order['order_id']}",
-                            token=st.session_state.access_token,
-                        )
-
-                        if history_response and history_response.status_code == 200:
-                            history = history_response.json()
-                            st.subheader("訂單狀態歷史")
-                            for status_change in history:
-                                try:
-                                    timestamp = datetime.fromisoformat(
-                                        status_change["changed_at"].replace(
-                                            "Z", "+00:00"
-                                        )
-                                    )
-                                    formatted_time = timestamp.strftime(
-                                        "%Y-%m-%d %H:%M:%S"
-                                    )
-                                except Exception:
-                                    formatted_time = status_change.get("changed_at")
-                                st.write(
-                                    f"- {formatted_time}: {status_change['status'].upper()}"
+                        st.subheader("訂單狀態歷史")
+                        for status_change in history:
+                            try:
+                                timestamp = datetime.fromisoformat(
+                                    status_change["changed_at"].replace("Z", "+00:00")
                                 )
+                                formatted_time = timestamp.strftime("%Y-%m-%d %H:%M:%S")
+                            except Exception:
+                                formatted_time = status_change.get("changed_at")
+                            st.write(
+                                f"- {formatted_time}: {status_change['status'].upper()}"
+                            )
                     else:
                         st.error("無法獲取訂單詳情")
 
@@ -464,113 +747,188 @@ def orders_page():
                             st.rerun()
                         else:
                             st.error("訂單取消失敗")
+
+        col_prev, col_page, col_next = st.columns([1, 2, 1])
+        with col_prev:
+            if len(cursors) > 1 and st.button("上一頁", key="orders_prev_page"):
+                cursors.pop()
+                st.rerun()
+        with col_page:
+            st.write(f"第 {len(cursors)} 頁")
+        with col_next:
+            if next_cursor and st.button("下一頁", key="orders_next_page"):
+                cursors.append(next_cursor)
+                st.rerun()
     else:
         st.error("無法獲取訂單列表")
 
 
+# 店員看板：WS 事件套用與初次載入
+def _ws_live():
+    return websocket is not None and st.session_state.ws_thread_started
+
+
+def apply_ws_events():
+    """取出 WS 事件佇列並就地更新已載入的看板，不重新呼叫列表端點"""
+    boards = st.session_state.live_boards
+    applied = 0
+    while True:
+        try:
+            event = st.session_state.ws_events.get_nowait()
+        except queue.Empty:
+            break
+        applied += 1
+        etype = event.get("type")
+        if etype == "resync_required":
+            boards.clear()
+            st.session_state.ws_resync_required = True
+            continue
+        st.session_state.ws_notifications = st.session_state.ws_notifications[
+            -(LIVE_BOARD_SIZE - 1) :
+        ] + [event]
+        if etype == "kitchen_order" and "kitchen" in boards:
+            ticket = event["kitchen_order"]
+            boards["kitchen"][ticket["kitchen_order_id"]] = ticket
+        elif etype == "delivery" and "delivery" in boards:
+            delivery = event["delivery"]
+            boards["delivery"][delivery["delivery_id"]] = delivery
+        elif etype == "new_order":
+            if "payments" in boards and event.get("pending_payment"):
+                boards["payments"][event["order_id"]] = event["pending_payment"]
+            st.toast(
+                f"🆕 新訂單 {event['order_id'][:8]}（${event['total_amount']:.2f}）"
+            )
+        elif etype == "order_status":
+            if "payments" in boards and event.get("status") != "pending":
+                boards["payments"].pop(event.get("order_id"), None)
+    return applied
+
+
+def load_board(name, endpoint, key_field):
+    """初次（或 resync 後）載入看板；之後由 apply_ws_events 更新"""
+    boards = st.session_state.live_boards
+    if name not in boards:
+        resp = make_api_request("GET", endpoint, token=st.session_state.access_token)
+        if not resp or resp.status_code != 200:
+            return None
+        boards[name] = {row[key_field]: row for row in resp.json()}
+    return boards[name]
+
+
+def _board_rows(board, newest_first=True):
+    """依建立時間排序並只保留 LIVE_BOARD_SIZE 筆"""
+    ordered = sorted(
+        board.items(),
+        key=lambda kv: kv[1].get("created_at") or "",
+        reverse=newest_first,
+    )
+    for key, _ in ordered[LIVE_BOARD_SIZE:]:
+        del board[key]
+    return [row for _, row in ordered[:LIVE_BOARD_SIZE]]
+
+
+def _manual_refresh(name):
+    """未啟用 WS 時提供手動重新整理"""
+    if not _ws_live() and st.button("重新整理", key=f"refresh_{name}"):
+        st.session_state.live_boards.pop(name, None)
+        st.rerun()
+
+
 # 店員支付確認頁面
 def payment_confirmation_page():
     st.header("💳 支付確認")
-    st.write("此功能僅供店員確認顧客支付。")
+    st.write("此功能僅供店員確認顧客支付。新訂單會即時出現，已處理的訂單會自動移除。")
+    _manual_refresh("payments")
+    payment_board()
 
-    response = make_api_request(
-        "GET", "/orchestration/orders", token=st.session_state.access_token
-    )
 
-    if response and response.status_code == 200:
-        orders = response.json()
-        pending_orders = [order for order in orders if order["status"] == "pending"]
+@st.fragment(run_every=LIVE_REFRESH_SECONDS)
+def payment_board():
+    apply_ws_events()
+    # 單一請求取得待確認訂單與其最新付款記錄
+    board = load_board("payments", "/orchestration/payments/pending", "order_id")
+    if board is None:
+        st.error("無法獲取訂單列表")
+        return
 
-        if not pending_orders:
-            st.info("暫無待確認支付的訂單")
-            return
+    pending_orders = _board_rows(board, newest_first=False)
+    if not pending_orders:
+        st.info("暫無待確認支付的訂單")
+        return
 
-        st.subheader("待確認支付的訂單")
+    st.subheader("待確認支付的訂單")
 
-        for order in pending_orders:
-            with st.container():
-                col1, col2 = st.columns(2)
-                with col1:
-                    st.write(f"**訂單ID:** {order['order_id']}")
-                    st.write(f"**總金額:** ${order['total_amount']:.2f}")
+    for order in pending_orders:
+        with st.container():
+            col1, col2 = st.columns(2)
+            with col1:
+                st.write(f"**訂單ID:** {order['order_id']}")
+                st.write(f"**總金額:** ${order['total_amount']:.2f}")
 
-                with col2:
-                    payment_id = None
-                    payment_resp = make_api_request(
-                        "GET",
-                        f"/orchestration/orders/{order['order_id']}/payment",
-                        token=st.session_state.access_token,
+            with col2:
+                payment_id = order.get("payment_id")
+                if payment_id:
+                    st.write(f"系統 Payment ID: {payment_id}")
+
+                if not payment_id:
+                    payment_id = st.text_input(
+                        "輸入Payment ID", key=f"payment_{order['order_id']}"
                     )
-                    if payment_resp and payment_resp.status_code == 200:
-                        try:
-                            payment_info = payment_resp.json()
-                            payment_id = payment_info.get("payment_id")
-                            st.write(f"系統 Payment ID: {payment_id}")
-                        except:
-                            payment_id = None
 
-                    if not payment_id:
-                        payment_id = st.text_input(
-                            "輸入Payment ID", key=f"payment_{order['order_id']}"
-                        )
+                if payment_id:
+                    col_success, col_fail = st.columns(2)
+                    with col_success:
+                        if st.button(
+                            "確認支付成功", key=f"confirm_{order['order_id']}"
+                        ):
+                            confirm_response = make_api_request(
+                                "POST",
+                                f"/orchestration/payments/{payment_id}/confirm",
+                                {"success": True},
+                                token=st.session_state.access_token,
+                            )
 
-                    if payment_id:
-                        col_success, col_fail = st.columns(2)
-                        with col_success:
-                            if st.button(
-                                "確認支付成功", key=f"confirm_{order['order_id']}"
-                            ):
-                                confirm_response = make_api_request(
-                                    "POST",
-                                    f"/orchestration/payments/{payment_id}/confirm",
-                                    {"success": True},
-                                    token=st.session_state.access_token,
-                                )
+                            if confirm_response and confirm_response.status_code == 200:
+                                st.toast("支付確認成功")
+                                board.pop(order["order_id"], None)
+                                st.rerun(scope="fragment")
+                            else:
+                                st.error("支付確認失敗")
 
-                                if (
-                                    confirm_response
-                                    and confirm_response.status_code == 200
-                                ):
-                                    st.success("支付確認成功")
-                                    time.sleep(1)
-                                    st.rerun()
-                                else:
-                                    st.error("支付確認失敗")
-
-                        with col_fail:
-                            if st.button(
-                                "標記支付失敗", key=f"fail_{order['order_id']}"
-                            ):
-                                fail_response = make_api_request(
-                                    "POST",
-                                    f"/orchestration/payments/{payment_id}/confirm",
-                                    {"success": False},
-                                    token=st.session_state.access_token,
-                                )
+                    with col_fail:
+                        if st.button("標記支付失敗", key=f"fail_{order['order_id']}"):
+                            fail_response = make_api_request(
+                                "POST",
+                                f"/orchestration/payments/{payment_id}/confirm",
+                                {"success": False},
+                                token=st.session_state.access_token,
+                            )
 
-                                if fail_response and fail_response.status_code == 200:
-                                    st.success("支付已標記為失敗")
-                                    time.sleep(1)
-                                    st.rerun()
-                                else:
-                                    st.error("操作失敗")
-    else:
-        st.error("無法獲取訂單列表")
+                            if fail_response and fail_response.status_code == 200:
+                                st.toast("支付已標記為失敗")
+                                board.pop(order["order_id"], None)
+                                st.rerun(scope="fragment")
+                            else:
+                                st.error("操作失敗")
 
 
-# 廚房訂單頁面（改為卡片 UI 且不在 callback 內直接 rerun）
+# 廚房訂單頁面（卡片 UI，由 WS 事件即時更新）
 def kitchen_orders_page():
     st.header("🍳 廚房訂單管理")
     st.write("列出近期廚房訂單。點選「標記完成」可將狀態由 preparing 變更為 ready。")
+    _manual_refresh("kitchen")
+    kitchen_board()
 
-    resp = make_api_request(
-        "GET", "/orchestration/kitchen/orders", token=st.session_state.access_token
-    )
-    if not resp or resp.status_code != 200:
+
+@st.fragment(run_every=LIVE_REFRESH_SECONDS)
+def kitchen_board():
+    apply_ws_events()
+    board = load_board("kitchen", "/orchestration/kitchen/orders", "kitchen_order_id")
+    if board is None:
         st.error("無法獲取廚房訂單列表")
         return
 
-    orders = resp.json()
+    orders = _board_rows(board)
     if not orders:
         st.info("暫無廚房訂單")
         return
@@ -593,7 +951,9 @@ def kitchen_orders_page():
                     st.write(f"狀態：{status}")
 
                 try:
-                    items = json.loads(k.get("items") or "[]")
+                    items = k.get("items") or []
+                    if isinstance(items, str):  # pre-order_items backend
+                        items = json.loads(items)
                     if items:
                         st.write("項目：")
                         for it in items:
@@ -615,27 +975,31 @@ def kitchen_orders_page():
                             token=st.session_state.access_token,
                         )
                         if resp_complete and resp_complete.status_code == 200:
-                            st.success("標記完成")
-                            # 不直接呼叫 st.experimental_rerun()，改為設定 flag
-                            st.session_state._needs_rerun = True
+                            st.toast("標記完成")
+                            # 只重繪看板；WS 事件也會帶來相同的更新
+                            k["status"] = "ready"
+                            st.rerun(scope="fragment")
                         else:
                             st.error("標記完成失敗")
 
 
-# 配送訂單頁面（改為列出近期配送單）
+# 配送訂單頁面（列出近期配送單，由 WS 事件即時更新）
 def delivery_page():
     st.header("🚚 配送訂單")
     st.write("顯示近期配送單（如無配送流程則此頁僅供檢視）。")
+    _manual_refresh("delivery")
+    delivery_board()
 
-    resp = make_api_request(
-        "GET", "/orchestration/delivery/orders", token=st.session_state.access_token
-    )
 
-    if not resp or resp.status_code != 200:
+@st.fragment(run_every=LIVE_REFRESH_SECONDS)
+def delivery_board():
+    apply_ws_events()
+    board = load_board("delivery", "/orchestration/delivery/orders", "delivery_id")
+    if board is None:
         st.error("無法獲取配送訂單列表")
         return
 
-    deliveries = resp.json()
+    deliveries = _board_rows(board)
     if not deliveries:
         st.info("暫無配送單")
         return
@@ -662,12 +1026,15 @@ def menu_admin_page():
         st.error("您沒有權限訪問此頁面")
         return
 
+    # 「查看菜單」與「編輯菜單」共用同一次載入
+    response = make_api_request("GET", "/orchestration/menu/items")
+    menu_loaded = bool(response and response.status_code == 200)
+    menu_items = response.json() if menu_loaded else []
+
     tab1, tab2, tab3 = st.tabs(["查看菜單", "新增菜單項", "編輯菜單"])
 
     with tab1:
-        response = make_api_request("GET", "/orchestration/menu/items")
-        if response and response.status_code == 200:
-            menu_items = response.json()
+        if menu_loaded:
             if not menu_items:
                 st.info("菜單暫無項目")
             else:
@@ -771,12 +1138,6 @@ def menu_admin_page():
                         st.error(f"菜單項新增失敗: {response.status_code} {err}")
 
     with tab3:
-        response = make_api_request("GET", "/orchestration/menu/items")
-        if response and response.status_code == 200:
-            menu_items = response.json()
-        else:
-            menu_items = []
-
         if not menu_items:
             st.info("暫無菜單項可編輯，請先新增菜單項")
             # 提供快速新增表單，避免使用者找不到新增按鈕時無法操作
@@ -820,7 +1181,7 @@ def menu_admin_page():
             if selected_item.get("image_url"):
                 try:
                     st.image(
-                        f"{ORDER_SERVICE_URL}{selected_item['image_url']}",
+                        menu_image_url(selected_item, "card"),
                         use_container_width=False,
                         width=200,
                     )
@@ -938,18 +1299,53 @@ def customer_management_page():
 
 
 # WebSocket 客戶端相關
-def _start_ws_client(token: str):
-    """在背景 thread 啟動 websocket-client 並將通知 append 到 st.session_state.ws_notifications"""
+def _start_ws_client(token: str, events: queue.Queue, stop: threading.Event):
+    """在背景 thread 啟動 websocket-client 並將通知放入 events 佇列
+
+    背景 thread 不碰 st.session_state；主線程由 apply_ws_events 取出事件。
+    每則通知帶有遞增的 seq；斷線後以指數退避重連並帶上最後收到的 last_seq，
+    後端只補送漏掉的通知。若漏掉的部分已超出後端保留範圍，會收到 resync_required，
+    主線程收到後清空看板並重新載入資料。
+    設定 stop（登出）會關閉目前連線並結束重連迴圈；迴圈因任何原因結束時也會設定 stop，
+    主線程據此在下次登入時重新啟動客戶端。
+    """
+    try:
+        _run_ws_client(token, events, stop)
+    finally:
+        stop.set()
+
+
+def _run_ws_client(token: str, events: queue.Queue, stop: threading.Event):
     if websocket is None:
         logger.info("websocket-client not installed; 無法啟動 WS 客戶端")
         return
 
+    state = {"last_seq": None, "close_code": None, "app": None}
+
+    def close_on_stop():
+        stop.wait()
+        if state["app"] is not None:
+            state["app"].close()
+
+    threading.Thread(target=close_on_stop, daemon=True).start()
+
     def on_message(ws, message):
         try:
             data = json.loads(message)
-            if "ws_notifications" not in st.session_state:
-                st.session_state.ws_notifications = []
-            st.session_state.ws_notifications.append(data)
+            seq = data.get("seq")
+            if data.get("type") == "hello":
+                if state["last_seq"] is None:
+                    state["last_seq"] = seq
+                return
+            if data.get("type") == "resync_required":
+                state["last_seq"] = seq
+                events.put(data)
+                return
+            if seq is not None:
+                if state["last_seq"] is not None and seq <= state["last_seq"]:
+                    return  # 重連補送時可能重複
+                state["last_seq"] = seq
+            events.put(data)
         except Exception:
             logger.exception("WS on_message 處理失敗")
 
@@ -957,20 +1353,63 @@ def _start_ws_client(token: str):
         logger.error("WS error: %s", error)
 
     def on_close(ws, close_status_code, close_msg):
+        state["close_code"] = close_status_code
         logger.info("WS closed: %s %s", close_status_code, close_msg)
 
     def on_open(ws):
-        logger.info("WS connected")
-
-    url = f"ws://localhost:8002/ws/notifications?token={token}"
-    ws_app = websocket.WebSocketApp(
-        url,
-        on_message=on_message,
-        on_error=on_error,
-        on_close=on_close,
-        on_open=on_open,
-    )
-    ws_app.run_forever()
+        nonlocal backoff
+        backoff = WS_RECONNECT_MIN_SECONDS
+        logger.info("WS connected (last_seq=%s)", state["last_seq"])
+
+    backoff = WS_RECONNECT_MIN_SECONDS
+    while not stop.is_set():
+        url = f"ws://localhost:8002/ws/notifications?token={token}"
+        if state["last_seq"] is not None:
+            url += f"&last_seq={state['last_seq']}"
+        state["close_code"] = None
+        ws_app = websocket.WebSocketApp(
+            url,
+            on_message=on_message,
+            on_error=on_error,
+            on_close=on_close,
+            on_open=on_open,
+        )
+        state["app"] = ws_app
+        if stop.is_set():
+            break
+        ws_app.run_forever()
+        if stop.is_set():
+            break
+        if state["close_code"] == 1008:
+            logger.info("WS 認證失敗（token 失效），停止重連")
+            return
+        stop.wait(backoff)
+        backoff = min(backoff * 2, WS_RECONNECT_MAX_SECONDS)
+    logger.info("WS 客戶端已停止")
+
+
+def stop_ws_client():
+    """登出時停止 WS thread，並清掉舊帳號的事件與看板"""
+    if st.session_state.ws_stop is not None:
+        st.session_state.ws_stop.set()
+    st.session_state.ws_stop = None
+    st.session_state.ws_thread_started = False
+    st.session_state.ws_events = queue.Queue()
+    st.session_state.live_boards = {}
+
+
+# 側邊欄：GET 快取命中率
+def render_cache_debug():
+    cache = get_api_cache()
+    rows = cache.stats_rows()
+    if rows:
+        st.table(rows)
+    else:
+        st.write("尚無快取查詢")
+    st.caption(f"快取項目: {len(cache)}，清除次數: {cache.invalidations}")
+    if st.button("清除快取", key="clear_api_cache"):
+        cache.invalidate()
+        st.rerun()
 
 
 # 主界面
@@ -1018,7 +1457,13 @@ def main():
 
             st.markdown("---")
 
+            if st.session_state.role in ["staff", "admin"] or API_CACHE_DEBUG:
+                with st.expander("🔧 快取除錯"):
+                    render_cache_debug()
+
             if st.button("登出"):
+                get_api_cache().invalidate()
+                stop_ws_client()
                 st.session_state.access_token = None
                 st.session_state.role = None
                 st.session_state.username = None
@@ -1030,6 +1475,31 @@ def main():
             st.info("請先登入")
             selected_page = "登入"
 
+    # 當店員登入且尚未啟動 WS thread 時啟動（在載入看板之前，避免漏掉事件）
+    if st.session_state.access_token and st.session_state.role in [
+        "staff",
+        "admin",
+    ]:
+        if st.session_state.ws_thread_started and st.session_state.ws_stop.is_set():
+            # 上一個 thread 已結束（例如 token 失效），允許重新啟動
+            st.session_state.ws_thread_started = False
+        if not st.session_state.ws_thread_started:
+            try:
+                st.session_state.ws_stop = threading.Event()
+                threading.Thread(
+                    target=_start_ws_client,
+                    args=(
+                        st.session_state.access_token,
+                        st.session_state.ws_events,
+                        st.session_state.ws_stop,
+                    ),
+                    daemon=True,
+                ).start()
+                st.session_state.ws_thread_started = True
+            except Exception as e:
+                st.warning(f"啟動 WS 客戶端失敗: {e}")
+        apply_ws_events()
+
     if not st.session_state.access_token:
         login_page()
     else:
@@ -1056,22 +1526,6 @@ def main():
             st.session_state._needs_rerun = False
             st.rerun()
 
-        # 當店員登入且尚未啟動 WS thread 時啟動
-        if st.session_state.access_token and st.session_state.role in [
-            "staff",
-            "admin",
-        ]:
-            if not st.session_state.ws_thread_started:
-                try:
-                    threading.Thread(
-                        target=_start_ws_client,
-                        args=(st.session_state.access_token,),
-                        daemon=True,
-                    ).start()
-                    st.session_state.ws_thread_started = True
-                except Exception as e:
-                    st.warning(f"啟動 WS 客戶端失敗: {e}")
-
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,21 @@
+"""Every hot query the backend issues must be served by an index.
+
+Runs against the PostgreSQL and Redis configured in backend_main (see
+docker-compose.yaml); skipped when they are not reachable.
+"""
+
+import pytest
+
+try:
+    import backend_main as bm  # noqa: F401  creates the schema
+    import db_migrations
+except Exception as exc:
+    pytest.skip(f"backend unavailable: {exc}", allow_module_level=True)
+
+HOT_QUERIES = db_migrations.hot_queries()
+
+
+@pytest.mark.parametrize("name", list(HOT_QUERIES))
+def test_hot_query_uses_an_index(name):
+    with db_migrations.engine.connect() as conn:
+        assert db_migrations.seq_scans(conn, HOT_QUERIES[name]) == []